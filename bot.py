@@ -0,0 +1,892 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+# orjson is optional - fall back to the stdlib json module when unavailable
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("discord_bot")
+
+# Suppress the PyNaCl warning since we don't need voice support
+discord.VoiceClient.warn_nacl = False
+
+# --------------------------------------------------------
+# STATE FILES
+# --------------------------------------------------------
+
+
+def _read_json_file(path):
+    """Load a JSON file, using orjson when it is installed"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _write_json_file(path, obj):
+    """Write a JSON file, using orjson when it is installed"""
+    data = orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+    # Write a temp file and swap it in so a crash mid-write can't leave a
+    # truncated file behind
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# --------------------------------------------------------
+# COOLDOWN CONFIGURATION
+# --------------------------------------------------------
+
+
+@dataclass(slots=True)
+class BotConfig:
+    """Cooldown settings, adjustable at runtime with /config"""
+    cooldown_seconds: int = 3  # Slowmode duration in seconds
+    monitoring_window: int = 10  # Time window in seconds to count messages
+    activity_threshold: int = 5  # Messages needed to trigger cooldown
+    inactivity_threshold: int = 2  # Messages needed to disable cooldown
+
+
+# Discord's max slowmode is 6 hours (21600 seconds)
+MAX_SLOWMODE_SECONDS = 21600
+
+# Activity monitor tick interval in seconds, backed off while idle
+ACTIVE_MONITOR_INTERVAL = 5
+IDLE_MONITOR_INTERVAL = 60
+
+# File remembering which command tree was last synced, so restarts skip
+# redundant syncs
+COMMAND_SYNC_FILE = "command_sync.json"
+
+# File holding monitored channels and settings across restarts
+STATE_FILE = "state.json"
+STATE_SAVE_DELAY = 1  # Seconds to batch state changes before writing
+
+# --------------------------------------------------------
+# BOT SETUP
+# --------------------------------------------------------
+
+# Create intents - only enable what's actually needed
+intents = discord.Intents.default()
+intents.message_content = True  # Required to read message content
+
+# Slash command choices
+_COOLDOWN_ACTIONS = [
+    app_commands.Choice(name="start", value="start"),
+    app_commands.Choice(name="stop", value="stop"),
+    app_commands.Choice(name="list", value="list")
+]
+_CONFIG_SETTINGS = [
+    app_commands.Choice(name="cooldown_duration", value="cooldown_seconds"),
+    app_commands.Choice(name="activity_threshold", value="activity_threshold"),
+    app_commands.Choice(name="inactivity_threshold",
+                        value="inactivity_threshold"),
+    app_commands.Choice(name="monitoring_window", value="monitoring_window")
+]
+
+# --------------------------------------------------------
+# BOT CLASS DEFINITION
+# --------------------------------------------------------
+
+
+class CooldownBot(commands.Bot):
+
+    def __init__(self, settings):
+        # Initialize bot with required intents
+        super().__init__(
+            command_prefix="!",
+            intents=intents,
+            # Add this to make sure application commands work properly
+            application_id=settings.application_id  # Get from .env file
+        )
+        self.settings = settings
+        self.cfg = BotConfig()
+        # Monitored text channels keyed by channel id
+        self.monitored_channels = {}
+        # Saved channel ids waiting for the channel cache to be ready
+        self._saved_channel_ids = []
+        self._state_save_handle = None
+        self._state_save_task = None
+        # Recent message timestamps, only for monitored channels
+        self.message_history = {}
+        # Last known slowmode per monitored channel
+        self._slowmode_cache = {}
+        # Track command sync status (signature of the last synced tree)
+        self._command_sync_flags = self._load_command_sync_flags()
+        # Bot permissions per channel, cleared when roles/overwrites change
+        self._perm_cache = {}
+        
+        # Track whether commands have already been set up
+        self._commands_registered = False
+
+    async def setup_hook(self):
+        """Called when the bot is starting up"""
+        # Run coroutines eagerly so tasks that finish without awaiting
+        # skip the event loop scheduler (Python 3.12+)
+        if hasattr(asyncio, "eager_task_factory"):
+            asyncio.get_running_loop().set_task_factory(
+                asyncio.eager_task_factory)
+
+        # Restore monitored channels and settings from the last run; a bad
+        # state file must not stop the monitor or commands from starting
+        try:
+            self._load_state()
+        except Exception as e:
+            logger.exception("Failed to load %s: %s", STATE_FILE, e)
+
+        try:
+            # Start activity monitor task
+            self.activity_monitor.start()
+            logger.info("Activity monitor task started successfully")
+
+            # Register commands only once
+            if not self._commands_registered:
+                self._setup_commands()
+                self._commands_registered = True
+
+            # Explicitly log all registered commands
+            all_commands = [cmd.name for cmd in self.tree.get_commands()]
+            logger.info("Registered commands at setup_hook: %s", all_commands)
+
+            # Global commands reach every guild (including ones joined later),
+            # so this is the only sync needed. Skip it if the command tree is
+            # unchanged since the last successful sync.
+            signature = self._command_tree_signature()
+            if self._command_sync_flags.get('global_synced') == signature:
+                logger.info("Commands unchanged since last global sync, skipping")
+            else:
+                try:
+                    logger.info("Attempting to sync commands globally...")
+                    await self.tree.sync()
+                    self._command_sync_flags['global_synced'] = signature
+                    self._save_command_sync_flags()
+                    logger.info("Commands synced globally")
+                except Exception as e:
+                    logger.exception("Failed to sync commands globally: %s", e)
+
+            # For testing, force a sync to the test guild if requested
+            test_guild_id = self.settings.test_guild_id
+            if test_guild_id and self.settings.force_guild_sync:
+                try:
+                    logger.info(
+                        "Syncing commands to test guild: %s", test_guild_id)
+                    test_guild = discord.Object(id=test_guild_id)
+                    await self.tree.sync(guild=test_guild)
+                    logger.info(
+                        "Commands synced to test guild %s", test_guild_id)
+                except Exception as e:
+                    logger.exception(
+                        "Failed to sync commands to test guild: %s", e)
+
+        except Exception as e:
+            logger.exception("Error in setup_hook: %s", e)
+
+    def _command_tree_signature(self):
+        """Hash the application id and global commands to detect changes"""
+        payload = {
+            "application_id": self.application_id,
+            "commands":
+            [cmd.to_dict(self.tree) for cmd in self.tree.get_commands()]
+        }
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _load_command_sync_flags(self):
+        """Load the command sync status saved by a previous run"""
+        try:
+            flags = _read_json_file(COMMAND_SYNC_FILE)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read %s: %s", COMMAND_SYNC_FILE, e)
+            return {}
+        if not isinstance(flags, dict):
+            logger.warning("Ignoring malformed %s", COMMAND_SYNC_FILE)
+            return {}
+        return flags
+
+    def _save_command_sync_flags(self):
+        """Persist the command sync status for the next run"""
+        try:
+            _write_json_file(COMMAND_SYNC_FILE, self._command_sync_flags)
+        except OSError as e:
+            logger.warning("Could not write %s: %s", COMMAND_SYNC_FILE, e)
+
+    def _setup_commands(self):
+        """Register commands during initialization"""
+        logger.info("Setting up commands...")
+
+        # You can also register commands directly
+        @self.tree.command(
+            name="cooldown",
+            description=
+            "Monitor a channel for activity and apply automatic cooldown.")
+        @app_commands.describe(
+            channel="The channel to monitor",
+            action=
+            "Choose an action: start monitoring, stop monitoring, or list monitored channels"
+        )
+        @app_commands.choices(action=_COOLDOWN_ACTIONS)
+        async def cooldown_command(interaction: discord.Interaction,
+                                   channel: discord.TextChannel = None,
+                                   action: str = "list"):
+            await self._handle_cooldown_command(interaction, channel, action)
+
+        @self.tree.command(
+            name="config",
+            description="View or change cooldown bot configuration settings.")
+        @app_commands.describe(setting="The setting to modify",
+                               value="The new value for the setting")
+        @app_commands.choices(setting=_CONFIG_SETTINGS)
+        async def config_command(interaction: discord.Interaction,
+                                 setting: str = None,
+                                 value: int = None):
+            await self._handle_config_command(interaction, setting, value)
+
+        logger.info(
+            "Command setup complete - registered commands: %s",
+            [cmd.name for cmd in self.tree.get_commands()])
+
+    async def on_ready(self):
+        """Called when the bot is ready"""
+        logger.info("Bot is online as %s", self.user)
+        logger.info("Bot ID: %s", self.user.id)
+
+        # A new READY means events may have been missed while the session
+        # couldn't be resumed, so cached permissions can't be trusted
+        self._perm_cache.clear()
+        # READY also rebuilds the channel cache with new objects
+        self._refresh_monitored_channels()
+
+        # Double-check command registration
+        all_commands = [cmd.name for cmd in self.tree.get_commands()]
+        logger.info("Registered commands at on_ready: %s", all_commands)
+
+        # Log information about the guilds the bot is in
+        logger.info("Connected to %s guilds", len(self.guilds))
+        for guild in self.guilds:
+            logger.info(
+                "Connected to guild: %s (ID: %s)", guild.name, guild.id)
+
+            # Check and log the bot's permissions in the guild; the bot
+            # member is missing while the guild is unavailable
+            me = guild.me
+            if me is not None:
+                permissions = me.guild_permissions
+                logger.info(
+                    "Bot permissions in %s: Administrator=%s, ManageChannels=%s",
+                    guild.name, permissions.administrator,
+                    permissions.manage_channels)
+
+    async def on_guild_join(self, guild):
+        """Called when the bot joins a new guild"""
+        logger.info("Joined new guild: %s (ID: %s)", guild.name, guild.id)
+
+        # Check the bot's permissions in the new guild
+        permissions = guild.me.guild_permissions
+        logger.info(
+            "Bot permissions in %s: Administrator=%s, ManageChannels=%s",
+            guild.name, permissions.administrator, permissions.manage_channels)
+
+        # Global commands already cover new guilds, so no sync is needed here
+
+    async def on_guild_remove(self, guild):
+        """Stop monitoring the channels of a guild the bot left"""
+        for channel_id, channel in list(self.monitored_channels.items()):
+            if channel.guild.id == guild.id:
+                self._stop_monitoring(channel_id)
+                self._perm_cache.pop(channel_id, None)
+                logger.info(
+                    "Left guild %s, removing channel %s from monitored list.",
+                    guild.id, channel_id)
+
+    async def on_guild_channel_update(self, before, after):
+        """Refresh cached channel state when a channel changes"""
+        self._perm_cache.pop(after.id, None)
+        if after.id in self.monitored_channels:
+            self.monitored_channels[after.id] = after
+        if after.id in self._slowmode_cache:
+            self._slowmode_cache[after.id] = after.slowmode_delay
+
+    async def on_guild_channel_delete(self, channel):
+        """Stop monitoring deleted channels and drop their cached state"""
+        if self._stop_monitoring(channel.id) is not None:
+            logger.info(
+                "Channel %s was deleted, removing from monitored list.",
+                channel.id)
+        self._perm_cache.pop(channel.id, None)
+
+    async def on_guild_role_update(self, before, after):
+        """Role permission changes can affect every channel in the guild"""
+        self._perm_cache.clear()
+
+    async def on_guild_role_delete(self, role):
+        """Deleting a role the bot holds changes its permissions"""
+        self._perm_cache.clear()
+
+    async def on_member_update(self, before, after):
+        """Invalidate cached permissions when the bot's own roles change"""
+        if after.id == self.user.id:
+            self._perm_cache.clear()
+
+    def _history_capacity(self):
+        """Number of timestamps to keep per channel"""
+        # Enough to compare against both thresholds - larger counts never
+        # change the slowmode decision
+        cfg = self.cfg
+        return max(cfg.activity_threshold * 2, cfg.inactivity_threshold + 1,
+                   16)
+
+    def _resize_histories(self):
+        """Rebuild history deques after a threshold change"""
+        capacity = self._history_capacity()
+        for channel_id, history in self.message_history.items():
+            self.message_history[channel_id] = deque(history, maxlen=capacity)
+
+    def _start_monitoring(self, channel):
+        """Begin tracking message activity for a channel"""
+        self.monitored_channels[channel.id] = channel
+        self._slowmode_cache[channel.id] = channel.slowmode_delay
+        if channel.id not in self.message_history:
+            self.message_history[channel.id] = deque(
+                maxlen=self._history_capacity())
+        self._update_monitor_interval()
+
+    def _stop_monitoring(self, channel_id):
+        """Remove a channel from monitoring and persist the change"""
+        self.message_history.pop(channel_id, None)
+        self._slowmode_cache.pop(channel_id, None)
+        channel = self.monitored_channels.pop(channel_id, None)
+        if channel is not None:
+            self._schedule_state_save()
+            self._update_monitor_interval()
+        return channel
+
+    def _refresh_monitored_channels(self):
+        """Swap stored channels for the current cached objects"""
+        for channel_id in list(self.monitored_channels):
+            channel = self.get_channel(channel_id)
+            if isinstance(channel, discord.TextChannel):
+                self.monitored_channels[channel_id] = channel
+                # Slowmode may have changed while we were disconnected
+                self._slowmode_cache[channel_id] = channel.slowmode_delay
+            else:
+                logger.warning(
+                    "Channel %s not found, removing from monitored list.",
+                    channel_id)
+                self._stop_monitoring(channel_id)
+
+    def _update_monitor_interval(self):
+        """Tick quickly while channels are monitored, slowly otherwise"""
+        seconds = (ACTIVE_MONITOR_INTERVAL
+                   if self.monitored_channels else IDLE_MONITOR_INTERVAL)
+        # change_interval reschedules the pending sleep of a running loop
+        if self.activity_monitor.seconds != seconds:
+            self.activity_monitor.change_interval(seconds=seconds)
+
+    def _load_state(self):
+        """Restore saved settings and queue saved channels for restoring"""
+        try:
+            state = _read_json_file(STATE_FILE)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read %s: %s", STATE_FILE, e)
+            return
+
+        if not isinstance(state, dict):
+            logger.warning("Ignoring malformed %s", STATE_FILE)
+            return
+
+        settings = state.get("settings")
+        if not isinstance(settings, dict):
+            settings = {}
+        for field in fields(BotConfig):
+            if field.name not in settings:
+                continue
+            value = settings[field.name]
+            # Apply the same checks as /config
+            if (not isinstance(value, int) or isinstance(value, bool)
+                    or value < 0 or (field.name == "cooldown_seconds"
+                                     and value > MAX_SLOWMODE_SECONDS)):
+                logger.warning("Ignoring invalid saved %s: %r", field.name,
+                               value)
+                continue
+            setattr(self.cfg, field.name, value)
+        channel_ids = state.get("channels", [])
+        if isinstance(channel_ids, list) and all(
+                isinstance(channel_id, int)
+                and not isinstance(channel_id, bool)
+                for channel_id in channel_ids):
+            self._saved_channel_ids = channel_ids
+        else:
+            logger.warning("Ignoring malformed saved channels in %s",
+                           STATE_FILE)
+        logger.info(
+            "Loaded state: %s saved channels", len(self._saved_channel_ids))
+
+    def _restore_saved_channels(self):
+        """Resume monitoring saved channels once the channel cache is ready"""
+        for channel_id in self._saved_channel_ids:
+            channel = self.get_channel(channel_id)
+            if isinstance(channel, discord.TextChannel):
+                self._start_monitoring(channel)
+            else:
+                logger.warning(
+                    "Saved channel %s is no longer available, not restoring it.",
+                    channel_id)
+        self._saved_channel_ids = []
+        logger.info(
+            "Restored monitoring for %s channels",
+            len(self.monitored_channels))
+
+    def _schedule_state_save(self):
+        """Save state shortly, batching changes made in quick succession"""
+        if self._state_save_handle is None:
+            self._state_save_handle = asyncio.get_running_loop().call_later(
+                STATE_SAVE_DELAY, self._start_state_save)
+
+    def _start_state_save(self):
+        self._state_save_handle = None
+        # Never overlap writes - retry once the running save has finished
+        if self._state_save_task is not None and not self._state_save_task.done():
+            self._schedule_state_save()
+            return
+        self._state_save_task = asyncio.create_task(self._save_state())
+
+    async def _save_state(self):
+        """Write monitored channels and settings without blocking the loop"""
+        state = {
+            # Keep saved channels that have not been restored yet
+            "channels": list(self.monitored_channels) + self._saved_channel_ids,
+            "settings": asdict(self.cfg)
+        }
+        try:
+            await asyncio.to_thread(_write_json_file, STATE_FILE, state)
+        except OSError as e:
+            logger.warning("Could not write %s: %s", STATE_FILE, e)
+
+    async def close(self):
+        """Flush any pending state save before shutting down"""
+        if self._state_save_task is not None:
+            await self._state_save_task
+        if self._state_save_handle is not None:
+            self._state_save_handle.cancel()
+            self._state_save_handle = None
+            await self._save_state()
+        await super().close()
+
+    def _get_bot_permissions(self, channel):
+        """Return the bot's permissions in a channel, using the cache"""
+        permissions = self._perm_cache.get(channel.id)
+        if permissions is None:
+            permissions = channel.permissions_for(channel.guild.me)
+            self._perm_cache[channel.id] = permissions
+        return permissions
+
+    async def on_connect(self):
+        logger.info("Bot connected to Discord")
+
+    async def on_disconnect(self):
+        logger.warning("Bot disconnected from Discord")
+
+    async def on_error(self, event, *args, **kwargs):
+        """Global error handler for bot events"""
+        logger.exception("Error in event %s", event)
+
+    @tasks.loop(seconds=IDLE_MONITOR_INTERVAL)
+    async def activity_monitor(self):
+        """Monitor message activity and adjust slowmode accordingly"""
+        cfg = self.cfg
+        monitoring_window = cfg.monitoring_window
+        activity_threshold = cfg.activity_threshold
+        inactivity_threshold = cfg.inactivity_threshold
+        cooldown_seconds = cfg.cooldown_seconds
+        cutoff_time = time.monotonic() - monitoring_window
+
+        # Make a copy of the channels to avoid modification during iteration
+        channels_to_check = list(self.monitored_channels.items())
+
+        if not channels_to_check:
+            return  # Skip if no channels are being monitored
+
+        # Slowmode changes for this tick as (channel, delay, notification)
+        slowmode_changes = []
+
+        for channel_id, channel in channels_to_check:
+            try:
+                # Drop expired timestamps - they are appended in order, so
+                # whatever remains is the recent message count
+                history = self.message_history.get(channel_id)
+                if history is None:
+                    continue  # Stopped while this tick was awaiting
+                while history and history[0] <= cutoff_time:
+                    history.popleft()
+                recent_messages = len(history)
+
+                # Nothing to do for idle channels without slowmode
+                current_slowmode = self._slowmode_cache.get(channel_id, 0)
+                if not recent_messages and not current_slowmode:
+                    continue
+
+                # Safely check permissions before trying to edit
+                bot_permissions = self._get_bot_permissions(channel)
+                if not bot_permissions.manage_channels:
+                    logger.warning(
+                        "Missing 'Manage Channels' permission for %s",
+                        channel.name)
+                    await self._notify_permission_error(channel_id)
+                    continue
+
+                logger.info(
+                    "Channel %s: %s messages in last %ss, current slowmode: %ss",
+                    channel.name, recent_messages, monitoring_window, current_slowmode)
+
+                # Skip notifications where the bot can't send messages
+                can_notify = bot_permissions.send_messages
+
+                # Apply or remove slowmode based on activity
+                if recent_messages >= activity_threshold and current_slowmode == 0:
+                    logger.info(
+                        "Enabling slowmode (%ss) in #%s",
+                        cooldown_seconds, channel.name)
+                    slowmode_changes.append((
+                        channel, cooldown_seconds,
+                        f"🐢 Slowmode enabled due to high activity. Cooldown set to {cooldown_seconds} seconds."
+                        if can_notify else None))
+
+                elif recent_messages <= inactivity_threshold and current_slowmode > 0:
+                    logger.info("Disabling slowmode in #%s", channel.name)
+                    slowmode_changes.append((
+                        channel, 0,
+                        "🚀 Activity has slowed down. Slowmode has been disabled."
+                        if can_notify else None))
+
+            except Exception as e:
+                logger.exception(
+                    "Unexpected error in activity monitor for channel ID %s: %s",
+                    channel_id, e)
+
+        if slowmode_changes:
+            await self._apply_slowmode_changes(slowmode_changes)
+
+    async def _apply_slowmode_changes(self, slowmode_changes):
+        """Apply slowmode edits concurrently, then notify the channels"""
+        results = await asyncio.gather(
+            *(channel.edit(slowmode_delay=delay)
+              for channel, delay, _ in slowmode_changes),
+            return_exceptions=True)
+
+        # Only notify channels whose slowmode was actually changed and
+        # that have a notification to send
+        notified_channels = []
+        notifications = []
+        for (channel, delay, text), result in zip(slowmode_changes, results):
+            if isinstance(result, discord.Forbidden):
+                logger.error(
+                    "Forbidden: Insufficient permissions for channel ID %s: %s",
+                    channel.id, result)
+                # Cached permissions are evidently stale
+                self._perm_cache.pop(channel.id, None)
+                # Also removes the channel to prevent repeated errors
+                await self._notify_permission_error(channel.id)
+            elif isinstance(result, discord.HTTPException):
+                logger.error(
+                    "HTTP error for channel ID %s: %s", channel.id, result)
+            elif isinstance(result, Exception):
+                logger.error(
+                    "Unexpected error updating slowmode for channel ID %s: %s",
+                    channel.id, result, exc_info=result)
+            else:
+                if channel.id in self._slowmode_cache:
+                    self._slowmode_cache[channel.id] = delay
+                if text:
+                    notified_channels.append(channel)
+                    notifications.append(channel.send(text))
+
+        results = await asyncio.gather(*notifications, return_exceptions=True)
+        for channel, result in zip(notified_channels, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Could not send notification to %s", channel.name)
+
+    async def _notify_permission_error(self, channel_id):
+        """Attempt to notify about permission errors"""
+        try:
+            channel = self.monitored_channels.get(channel_id)
+            if channel:
+                # Check if we can at least send messages
+                bot_permissions = self._get_bot_permissions(channel)
+                if bot_permissions.send_messages:
+                    await channel.send(
+                        "⚠️ I don't have permission to manage slowmode in this channel. Please give me 'Manage Channel' permissions."
+                    )
+
+                # Remove channel from monitoring to prevent repeated errors
+                self._stop_monitoring(channel_id)
+                logger.info(
+                    "Removed channel %s from monitoring due to permission issues",
+                    channel.name)
+        except Exception as e:
+            logger.error("Failed to send permission error notification: %s", e)
+            # Remove channel anyway
+            self._stop_monitoring(channel_id)
+
+    @activity_monitor.before_loop
+    async def before_activity_monitor(self):
+        """Wait until bot is ready before starting tasks"""
+        await self.wait_until_ready()
+        self._restore_saved_channels()
+        logger.info("Activity monitor ready to start")
+
+    @activity_monitor.error
+    async def activity_monitor_error(self, error):
+        """Handle errors in the activity monitor task"""
+        logger.error("Error in activity monitor task: %s",
+                     error,
+                     exc_info=error)
+
+    async def on_message(self, message):
+        """Process incoming messages"""
+        # Skip processing bot messages
+        if message.author.bot:
+            return
+
+        # The bot only uses slash commands, so there are no prefix commands
+        # to process - just record timestamps for monitored channels
+        history = self.message_history.get(message.channel.id)
+        if history is not None:
+            history.append(time.monotonic())
+
+    # Slash command handlers
+    async def _handle_cooldown_command(self,
+                                       interaction,
+                                       channel,
+                                       action="list"):
+        """Handler for the /cooldown command"""
+        try:
+            # Check user permissions
+            if not self._has_permission(interaction.user, interaction.guild):
+                await interaction.response.send_message(
+                    "You don't have permission to use this command. You need Administrator or Manage Channels permission.",
+                    ephemeral=True)
+                logger.info(
+                    "User %s attempted to use cooldown command without permission",
+                    interaction.user)
+                return
+
+            # Handle list action
+            if action == "list":
+                if not self.monitored_channels:
+                    await interaction.response.send_message(
+                        "No channels are currently being monitored.",
+                        ephemeral=True)
+                    return
+
+                # Deleted channels are dropped in on_guild_channel_delete
+                channel_mentions = [
+                    f"• {channel.mention}"
+                    for channel in self.monitored_channels.values()
+                ]
+                await interaction.response.send_message(
+                    f"**Currently monitoring {len(channel_mentions)} channels:**\n"
+                    + "\n".join(channel_mentions),
+                    ephemeral=True)
+                return
+
+            # For other actions, channel parameter is required
+            if not channel:
+                await interaction.response.send_message(
+                    "Please specify a channel for this action.",
+                    ephemeral=True)
+                return
+
+            # Check if the bot has permissions for the channel
+            bot_member = interaction.guild.me
+            channel_perms = channel.permissions_for(bot_member)
+            if not channel_perms.manage_channels:
+                await interaction.response.send_message(
+                    f"I don't have 'Manage Channels' permission for {channel.mention}. Please update my permissions.",
+                    ephemeral=True)
+                return
+
+            # Handle start action
+            if action == "start":
+                self._start_monitoring(channel)
+                self._schedule_state_save()
+                logger.info(
+                    "User %s started monitoring channel #%s (%s)",
+                    interaction.user, channel.name, channel.id)
+                await interaction.response.send_message(
+                    f"Now monitoring {channel.mention}. Cooldown will be applied when messages exceed {self.cfg.activity_threshold} within {self.cfg.monitoring_window} seconds.",
+                    ephemeral=True)
+
+                # Inform the channel that it's being monitored
+                if channel_perms.send_messages:
+                    try:
+                        await channel.send(
+                            f"🔍 **This channel is now being monitored by CooldownBot.**\n• Slowmode will be applied when activity exceeds {self.cfg.activity_threshold} messages in {self.cfg.monitoring_window} seconds.\n• Slowmode will be disabled when activity drops below {self.cfg.inactivity_threshold} messages in {self.cfg.monitoring_window} seconds."
+                        )
+                    except discord.HTTPException:
+                        logger.warning(
+                            "Could not send notification to %s", channel.name)
+
+            # Handle stop action
+            elif action == "stop":
+                if channel.id in self.monitored_channels:
+                    self._stop_monitoring(channel.id)
+                    logger.info(
+                        "User %s stopped monitoring channel #%s (%s)",
+                        interaction.user, channel.name, channel.id)
+
+                    # Reset slowmode if it was enabled
+                    if channel.slowmode_delay > 0:
+                        try:
+                            await channel.edit(slowmode_delay=0)
+                            await interaction.response.send_message(
+                                f"Stopped monitoring {channel.mention} and disabled slowmode.",
+                                ephemeral=True)
+
+                            # Inform the channel
+                            if channel_perms.send_messages:
+                                try:
+                                    await channel.send(
+                                        "🛑 **Channel is no longer being monitored by CooldownBot.** Slowmode has been disabled."
+                                    )
+                                except discord.HTTPException:
+                                    logger.warning(
+                                        "Could not send notification to %s",
+                                        channel.name)
+                        except Exception as e:
+                            logger.error(
+                                "Failed to disable slowmode when stopping monitor: %s",
+                                e)
+                            await interaction.response.send_message(
+                                f"Stopped monitoring {channel.mention}, but couldn't disable slowmode.",
+                                ephemeral=True)
+                    else:
+                        await interaction.response.send_message(
+                            f"Stopped monitoring {channel.mention}.",
+                            ephemeral=True)
+
+                        # Inform the channel
+                        if channel_perms.send_messages:
+                            try:
+                                await channel.send(
+                                    "🛑 **Channel is no longer being monitored by CooldownBot.**"
+                                )
+                            except discord.HTTPException:
+                                logger.warning(
+                                    "Could not send notification to %s",
+                                    channel.name)
+                else:
+                    await interaction.response.send_message(
+                        f"{channel.mention} was not being monitored.",
+                        ephemeral=True)
+
+            # Handle invalid action
+            else:
+                await interaction.response.send_message(
+                    "Invalid action. Please use 'start', 'stop', or 'list'.",
+                    ephemeral=True)
+
+        except discord.Forbidden as e:
+            logger.error("Permission error in cooldown command: %s", e)
+            await interaction.response.send_message(
+                "I don't have permission to perform this action.",
+                ephemeral=True)
+        except Exception as e:
+            logger.exception("Error in cooldown command: %s", e)
+            await interaction.response.send_message(
+                f"An error occurred while processing this command. Please check the bot logs.",
+                ephemeral=True)
+
+    async def _handle_config_command(self,
+                                     interaction,
+                                     setting=None,
+                                     value=None):
+        """Handler for the /config command"""
+        try:
+            # Check permissions
+            if not interaction.user.guild_permissions.administrator:
+                await interaction.response.send_message(
+                    "You need Administrator permission to modify bot configuration.",
+                    ephemeral=True)
+                return
+
+            # Current settings for display
+            settings = asdict(self.cfg)
+
+            # Just display settings if no specific setting requested
+            if not setting:
+                settings_text = "\n".join(
+                    [f"• **{k}**: {v}" for k, v in settings.items()])
+                await interaction.response.send_message(
+                    f"**Current Bot Configuration:**\n{settings_text}",
+                    ephemeral=True)
+                return
+
+            # Update the specified setting if a value is provided
+            if value is not None:
+                if value < 0:
+                    await interaction.response.send_message(
+                        "Setting values must be positive numbers.",
+                        ephemeral=True)
+                    return
+
+                if setting == "cooldown_seconds" and value > MAX_SLOWMODE_SECONDS:
+                    await interaction.response.send_message(
+                        "Slowmode can't be longer than 6 hours (21600 seconds).",
+                        ephemeral=True)
+                    return
+                setattr(self.cfg, setting, value)
+                if setting in ("activity_threshold", "inactivity_threshold"):
+                    self._resize_histories()
+
+                self._schedule_state_save()
+                logger.info(
+                    "User %s updated %s to %s",
+                    interaction.user, setting, value)
+                await interaction.response.send_message(
+                    f"Updated setting **{setting}** to **{value}**.",
+                    ephemeral=True)
+            else:
+                # Just show the current value for the specified setting
+                await interaction.response.send_message(
+                    f"Current value of **{setting}** is **{settings[setting]}**.",
+                    ephemeral=True)
+        except Exception as e:
+            logger.exception("Error in config command: %s", e)
+            await interaction.response.send_message(
+                "An error occurred while processing this command.",
+                ephemeral=True)
+
+    def _has_permission(self, user, guild):
+        """Check if a user has permission to use the bot commands"""
+        # Administrator permission always has access
+        if user.guild_permissions.administrator:
+            return True
+
+        # Check if user has "Manage Channels" permission
+        if user.guild_permissions.manage_channels:
+            return True
+
+        # Check role hierarchy (user must have higher role than bot)
+        bot_member = guild.me
+        if not bot_member:
+            logger.warning("Could not find bot member in guild %s", guild.id)
+            return False
+
+        return user.top_role > bot_member.top_role